@@ -1,27 +1,38 @@
 """Services for the chat command."""
 
+from collections import deque
 from collections.abc import Iterator
 from dataclasses import dataclass, field
+from typing import Any
 
 from arey.config import get_config
 from arey.core import (
     ChatMessage,
     CompletionMetrics,
     CompletionModel,
+    MetricsAccumulator,
     ModelMetrics,
     SenderType,
-    combine_metrics,
 )
 from arey.platform.console import capture_stderr
 from arey.platform.llm import get_completion_llm
 
-config = get_config()
-completion_settings = config.chat.profile
+_model: CompletionModel | None = None
 
-model: CompletionModel = get_completion_llm(config.chat.model)
+# Characters in a token, used to skip tokenization of messages that can't fit
+# in the history. Heuristic, tokens are rarely longer, e.g., runs of whitespace.
+# A message with such tokens may be trimmed from history though it fits.
+_MAX_CHARS_PER_TOKEN = 32
 
+# Tokens added by the chat template around each message for role and turn
+# delimiters. Chatml adds about 5, others may add a few more.
+_MESSAGE_OVERHEAD_TOKENS = 8
 
-@dataclass
+# Tokens reserved in the context for the assistant's reply.
+_REPLY_TOKENS = 512
+
+
+@dataclass(slots=True)
 class MessageContext:
     """Context associated with a single chat message."""
 
@@ -31,92 +42,133 @@ class MessageContext:
     logs: str = ""
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Message(ChatMessage):
     """A chat message with context."""
 
     timestamp: int  # unix timestamp
     context: MessageContext | None
+    token_count: int | None = None  # cached count of tokens in text
 
-    def to_chat(self):
-        """Convert to a chat message."""
-        return ChatMessage(sender=self.sender, text=self.text)
 
-
-@dataclass
+@dataclass(slots=True)
 class ChatContext:
     """Context associated with a chat."""
 
     metrics: ModelMetrics | None = None
     logs: str = ""
+    max_tokens: int = 0  # token budget for history, zero if unknown
+    settings: dict[str, Any] = field(default_factory=dict)  # completion settings
 
 
-@dataclass
+@dataclass(slots=True)
 class Chat:
     """A chat conversation between human and AI model."""
 
     messages: list[Message] = field(default_factory=list)
     context: ChatContext = field(default_factory=ChatContext)
+    last_ai_index: int = -1  # index of the latest assistant message
+
 
+def _get_max_tokens(model: CompletionModel) -> int:
+    """Get the token budget for chat history. Zero if context size is unknown."""
+    context_size = model.context_size
+    if context_size <= 0:
+        return 0
 
-# def _get_max_tokens(model: CompletionModel, prompt_model: Prompt, text: str) -> int:
-#     context_size = model.context_size
-#     prompt_tokens_without_history = model.count_tokens(
-#         prompt_model.get("chat", {"user_query": text, "chat_history": ""})
-#     )
-#     buffer = 200
-#
-#     return context_size - prompt_tokens_without_history - buffer
+    # Reply is prefixed with template tokens too, see `get_history`. Latest
+    # message is always sent, even if the context is too small for it.
+    return max(context_size - _REPLY_TOKENS - _MESSAGE_OVERHEAD_TOKENS, 1)
 
 
-def create_chat(model_name: str | None) -> tuple[Chat, ModelMetrics]:
-    """Create a new chat session."""
+def _get_model() -> CompletionModel:
+    """Get the chat model, it is created on first use."""
+    global _model
+    if _model is None:
+        _model = get_completion_llm(get_config().chat.model)
+    return _model
+
+
+def get_chat_model(model_name: str | None) -> CompletionModel:
+    """Get the model for chat, it is validated but not loaded.
+
+    Uses the model from config with given name, or the default chat model.
+    """
+    global _model
+    config = get_config()
+    if model_name is not None and model_name in config.models:
+        _model = get_completion_llm(config.models[model_name])
+    return _get_model()
+
+
+def create_chat(model: CompletionModel) -> tuple[Chat, ModelMetrics]:
+    """Create a new chat session, the model is loaded in memory.
+
+    Process stderr is captured into the chat logs while the model loads. It
+    includes writes from any other thread in that duration.
+    """
     # FIXME
     # system_prompt = prompt_model.get_message("system", "") if prompt_model else ""
-    global model
     system_prompt = ""
-    if model_name is not None and model_name in config.models:
-        model = get_completion_llm(config.models[model_name])
-
     with capture_stderr() as stderr:
         model.load(system_prompt)
     chat = Chat()
     chat.context.metrics = model.metrics
     chat.context.logs = stderr.getvalue()
+    chat.context.max_tokens = _get_max_tokens(model)
+    chat.context.settings = get_config().chat.profile.model_dump()
     return chat, model.metrics
 
 
-# def get_history(
-#     model: CompletionModel, chat: Chat, prompt_model: Prompt, max_tokens: int
-# ) -> str:
-#     """Get the messages for a chat."""
-#     messages = []
-#     token_count = 0
-#     for message in reversed(chat.messages):
-#         role = message.sender.role()
-#         formatted_message = prompt_model.get_message(role, message.text)
-#         message_tokens = model.count_tokens(formatted_message)
-#         messages.insert(0, formatted_message)
-#
-#         token_count += message_tokens
-#         if message.sender == SenderType.USER and token_count >= max_tokens:
-#             break
-#
-#     return "".join(messages)
+def get_history(
+    model: CompletionModel, chat: Chat, max_tokens: int
+) -> list[ChatMessage]:
+    """Get the recent messages for a chat which fit in max_tokens.
+
+    History always starts with a user message. Latest message is always
+    included even if it doesn't fit. All messages are returned if max_tokens is
+    zero.
+
+    Each message is counted with `_MESSAGE_OVERHEAD_TOKENS` for the tokens the
+    chat template adds around it.
+
+    Messages are only appended to a chat and never reordered. Prompt of a turn
+    extends the prompt of the previous turn until history is trimmed, this
+    allows the model to reuse the evaluated prefix.
+    """
+    # Messages are passed as is, they're chat messages and never mutated
+    if max_tokens <= 0:
+        return list(chat.messages)
+
+    messages: deque[ChatMessage] = deque()
+    token_count = 0
+    for message in reversed(chat.messages):
+        # Messages are immutable once added to chat, count the tokens once
+        if message.token_count is None:
+            # Don't tokenize a message which can't fit in remaining budget
+            budget = max_tokens - token_count - _MESSAGE_OVERHEAD_TOKENS
+            max_chars = budget * _MAX_CHARS_PER_TOKEN
+            if messages and len(message.text) > max_chars:
+                break
+            message.token_count = model.count_tokens(message.text)
+
+        token_count += message.token_count + _MESSAGE_OVERHEAD_TOKENS
+        if messages and token_count > max_tokens:
+            break
+        messages.appendleft(message)
+
+    while len(messages) > 1 and messages[0].sender != SenderType.USER:
+        messages.popleft()
+    return list(messages)
 
 
 def create_response(chat: Chat, message: str) -> str:
     """Create a chat response."""
-    response = ""
-    for chunk in stream_response(chat, message):
-        response += chunk
-
-    return response
+    return "".join(stream_response(chat, message))
 
 
 def stream_response(chat: Chat, message: str) -> Iterator[str]:
     """Stream a chat response."""
-    # max_tokens = _get_max_tokens(model, prompt_model, message)
     # context = {
     #     "user_query": message,
     #     "chat_history": get_history(model, chat, prompt_model, max_tokens),
@@ -126,34 +178,38 @@ def stream_response(chat: Chat, message: str) -> Iterator[str]:
     user_msg = Message(text=message, sender=SenderType.USER, timestamp=0, context=None)
     chat.messages.append(user_msg)
 
-    ai_msg_text = ""
-    usage_series: list[CompletionMetrics] = []
+    ai_msg_parts: list[str] = []
     finish_reason = ""
+    usage = MetricsAccumulator()
+    model = _get_model()
     with capture_stderr() as stderr:
         # for chunk in model.complete(chat.messages, {"stop": prompt_model.stop_words}):
-        chat_messages = [m.to_chat() for m in chat.messages]
-        for chunk in model.complete(chat_messages, {}):
-            ai_msg_text += chunk.text
+        chat_messages = get_history(model, chat, chat.context.max_tokens)
+        for chunk in model.complete(chat_messages, chat.context.settings):
+            ai_msg_parts.append(chunk.text)
             finish_reason = chunk.finish_reason
-            usage_series.append(chunk.metrics)
+            usage.add(chunk.metrics)
             yield chunk.text
 
     msg_context = MessageContext(
         prompt="",
         finish_reason=finish_reason,
-        metrics=combine_metrics(usage_series),
+        metrics=usage.result(),
         logs=stderr.getvalue(),
     )
     ai_msg = Message(
-        text=ai_msg_text, timestamp=0, sender=SenderType.ASSISTANT, context=msg_context
+        text="".join(ai_msg_parts),
+        timestamp=0,
+        sender=SenderType.ASSISTANT,
+        context=msg_context,
     )
     chat.messages.append(ai_msg)
+    chat.last_ai_index = len(chat.messages) - 1
 
 
 def get_completion_metrics(chat: Chat) -> CompletionMetrics | None:
     """Get completion metrics for the chat."""
-    msg = next(
-        filter(lambda m: m.sender == SenderType.ASSISTANT, reversed(chat.messages)),
-        None,
-    )
-    return msg.context.metrics if msg and msg.context else None
+    if chat.last_ai_index < 0:
+        return None
+    msg = chat.messages[chat.last_ai_index]
+    return msg.context.metrics if msg.context else None
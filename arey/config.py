@@ -1,13 +1,22 @@
 """Configuration for arey."""
 
+import copy
+import json
 import os
+from functools import cache
 from typing import Any, cast
 
 import yaml
 from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
 
 from arey.core import AreyError, ModelConfig
-from arey.platform.assets import get_config_dir, get_default_config
+from arey.platform.assets import get_cache_dir, get_config_dir, get_default_config
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    # libyaml is not available, use the pure python loader
+    from yaml import SafeLoader  # pyright: ignore[reportAssignmentType]
 
 
 class ProfileConfig(BaseModel):
@@ -99,18 +108,85 @@ def create_or_get_config_file() -> tuple[bool, str]:
     return (False, config_file)
 
 
+def _get_config_cache_file() -> str:
+    # Cache is kept out of the config dir, it is often tracked in dotfiles
+    return os.path.join(get_cache_dir(), "config.json")
+
+
+def _write_config_cache(cache_file: str, data: dict[str, Any]) -> None:
+    tmp_file = f"{cache_file}.tmp"
+    try:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+        # Config may have secrets, e.g., api keys. Only the user can read it.
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_file, cache_file)
+    except (OSError, TypeError, ValueError):
+        # Cache is best effort, config may have values json can't represent
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def _has_str_keys(data: Any) -> bool:
+    """Check if all mapping keys are strings, json would convert others."""
+    if isinstance(data, dict):
+        return all(
+            isinstance(k, str) and _has_str_keys(v)
+            for k, v in cast(dict[Any, Any], data).items()
+        )
+    if isinstance(data, list):
+        return all(_has_str_keys(v) for v in cast(list[Any], data))
+    return True
+
+
+def _get_cache_key(config_file: str, stat: os.stat_result) -> list[Any]:
+    return [config_file, stat.st_mtime_ns, stat.st_size]
+
+
+def _read_config_cache(cache_file: str, cache_key: list[Any]) -> dict[str, Any] | None:
+    """Read the parsed config from json cache if it is up to date.
+
+    Cache is keyed by the config file's path, modification time and size. It
+    saves a yaml parse on every cli invocation.
+    """
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cache: dict[str, Any] = json.load(f)
+        config_data = cache["config"]
+        if cache["key"] == cache_key and isinstance(config_data, dict):
+            return cast(dict[str, Any], config_data)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+@cache
 def get_config() -> Config:
     """Get the app configuration if available."""
-    config = getattr(get_config, "config", None)
-    if config:
-        return cast(Config, config)
-
     _, config_file = create_or_get_config_file()
-    with open(config_file, "r", encoding="utf-8") as f:
-        config_data: dict[str, Any] = yaml.safe_load(f) or {}
-        try:
-            config = Config(**config_data)  # pyright: ignore[reportAny]
-        except ValidationError as e:
-            raise AreyError("config", f"Configuration is invalid. Errors: {e.errors}")
-        setattr(get_config, "config", config)
-        return config
+    cache_file = _get_config_cache_file()
+    cache_key = _get_cache_key(config_file, os.stat(config_file))
+    cached_data = _read_config_cache(cache_file, cache_key)
+    raw_data = None
+    if cached_data is None:
+        with open(config_file, "r", encoding="utf-8") as f:
+            config_data: dict[str, Any] = yaml.load(f, Loader=SafeLoader) or {}
+
+        # Validation resolves models in place, keep the file's content for cache
+        if _has_str_keys(config_data):
+            raw_data = copy.deepcopy(config_data)
+    else:
+        config_data = cached_data
+
+    try:
+        config = Config(**config_data)  # pyright: ignore[reportAny]
+    except ValidationError as e:
+        raise AreyError("config", f"Configuration is invalid. Errors: {e.errors}")
+
+    # Only cache a valid config which round trips through json unchanged
+    if raw_data is not None:
+        _write_config_cache(cache_file, {"key": cache_key, "config": raw_data})
+    return config
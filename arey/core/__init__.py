@@ -5,8 +5,8 @@ from ._completion import (
     CompletionMetrics,
     CompletionModel,
     CompletionResponse,
+    MetricsAccumulator,
     SenderType,
-    combine_metrics,
 )
 from ._error import AreyError
 from ._model import ModelConfig, ModelMetrics
@@ -21,7 +21,7 @@ __all__ = [
     "CompletionModel",
     "CompletionResponse",
     "CompletionMetrics",
-    "combine_metrics",
+    "MetricsAccumulator",
     # Chat
     "SenderType",
     "ChatMessage",
@@ -4,7 +4,7 @@ from abc import ABC, ABCMeta, abstractmethod
 from collections.abc import Iterator
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Literal, cast
+from typing import Any, Literal, NamedTuple
 
 from arey.core._model import ModelConfig, ModelMetrics
 
@@ -20,10 +20,17 @@ class SenderType(Enum):
 
     def role(self) -> SenderTypeLiteral:
         """Convert the sender to role."""
-        return cast(SenderTypeLiteral, self.name.lower())
+        return _SENDER_ROLES[self]
 
 
-@dataclass(kw_only=True)
+_SENDER_ROLES: dict[SenderType, SenderTypeLiteral] = {
+    SenderType.SYSTEM: "system",
+    SenderType.ASSISTANT: "assistant",
+    SenderType.USER: "user",
+}
+
+
+@dataclass(kw_only=True, slots=True)
 class ChatMessage:
     """A chat message."""
 
@@ -31,8 +38,7 @@ class ChatMessage:
     sender: SenderType
 
 
-@dataclass
-class CompletionMetrics:
+class CompletionMetrics(NamedTuple):
     """Metrics related to a single completion."""
 
     prompt_tokens: int
@@ -55,7 +61,7 @@ class CompletionMetrics:
     """Time taken for this completion."""
 
 
-@dataclass
+@dataclass(slots=True)
 class CompletionResponse:
     """Response from a generative ai model."""
 
@@ -107,17 +113,35 @@ class CompletionModel(ABC, metaclass=ABCMeta):
         return True
 
 
-def combine_metrics(usage_series: list[CompletionMetrics]) -> CompletionMetrics:
-    """Join a series of completion metrics into one."""
-    response_latency = 0
-    response_tokens = 0
-    for u in usage_series:
-        response_latency += u.completion_latency_ms
-        response_tokens += u.completion_tokens
-    return CompletionMetrics(
-        prompt_tokens=usage_series[-1].prompt_tokens,
-        prompt_eval_latency_ms=usage_series[0].prompt_eval_latency_ms,
-        completion_tokens=response_tokens,
-        completion_runs=len(usage_series),
-        completion_latency_ms=response_latency,
-    )
+@dataclass(slots=True)
+class MetricsAccumulator:
+    """Combine metrics of the chunks of a completion as they are streamed.
+
+    Prompt metrics come from the chunks, completion tokens and latency are
+    summed up over all chunks.
+    """
+
+    prompt_tokens: int = 0
+    prompt_eval_latency_ms: float = 0.0
+    completion_tokens: int = 0
+    completion_runs: int = 0
+    completion_latency_ms: float = 0.0
+
+    def add(self, metrics: CompletionMetrics) -> None:
+        """Add metrics of a completion chunk."""
+        if self.completion_runs == 0:
+            self.prompt_eval_latency_ms = metrics.prompt_eval_latency_ms
+        self.prompt_tokens = metrics.prompt_tokens
+        self.completion_tokens += metrics.completion_tokens
+        self.completion_latency_ms += metrics.completion_latency_ms
+        self.completion_runs += 1
+
+    def result(self) -> CompletionMetrics:
+        """Get the combined metrics of chunks added so far."""
+        return CompletionMetrics(
+            prompt_tokens=self.prompt_tokens,
+            prompt_eval_latency_ms=self.prompt_eval_latency_ms,
+            completion_tokens=self.completion_tokens,
+            completion_runs=self.completion_runs,
+            completion_latency_ms=self.completion_latency_ms,
+        )
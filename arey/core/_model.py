@@ -42,7 +42,7 @@ class ModelConfig(BaseModel):
         return self
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelMetrics:
     """Metrics for the model."""
 
@@ -3,10 +3,11 @@
 #!/usr/bin/env python
 import datetime
 import signal
+import threading
 from collections.abc import Iterable
-from functools import wraps
+from functools import partial, wraps
 from types import FrameType
-from typing import Any, Callable
+from typing import Any, Callable, Generic, TypeVar, cast
 
 import click
 from rich.console import Console, Group
@@ -14,12 +15,47 @@ from rich.live import Live
 from rich.markdown import Markdown
 from rich.spinner import Spinner
 from rich.text import Text
-from watchfiles import watch
 
 from arey.core import AreyError, CompletionMetrics
 from arey.platform.console import SignalContextManager, get_console
-from arey.play import PlayFile
-from arey.task import close
+
+T = TypeVar("T")
+
+
+def _stop_completion_handler(
+    stop_completion: threading.Event, _signal: signal.Signals, _frame: FrameType
+) -> None:
+    stop_completion.set()
+
+
+class _BackgroundCall(Generic[T]):
+    """Run a function in a daemon thread, get the result when required.
+
+    Daemon thread doesn't block the app from exiting while it runs.
+    """
+
+    def __init__(self, func: Callable[[], T]) -> None:
+        """Start running the function."""
+        self._result: T | None = None
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, args=(func,), daemon=True)
+        self._thread.start()
+
+    def _run(self, func: Callable[[], T]) -> None:
+        try:
+            self._result = func()
+        except BaseException as e:
+            self._error = e
+
+    def result(self) -> T:
+        """Wait for the function to complete and get its result.
+
+        Raises the exception from the function if it failed.
+        """
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return cast(T, self._result)
 
 
 def _generate_response(
@@ -28,11 +64,8 @@ def _generate_response(
     run: Callable[[], Iterable[str]],
     get_metrics: Callable[[], CompletionMetrics | None],
 ) -> None:
-    stop_completion = False
-
-    def stop_completion_handler(_signal: signal.Signals, _frame: FrameType):
-        nonlocal stop_completion
-        stop_completion = True
+    stop_completion = threading.Event()
+    stop_completion_handler = partial(_stop_completion_handler, stop_completion)
 
     text = Text()
     status = Spinner(
@@ -45,7 +78,7 @@ def _generate_response(
         # beyond the terminal height.
         with Live(output, console=console, transient=True, vertical_overflow="visible"):
             for response in run():
-                if stop_completion:
+                if stop_completion.is_set():
                     break
                 if len(text) < 1 and status in output.renderables:
                     output.renderables.remove(status)
@@ -55,15 +88,18 @@ def _generate_response(
     plain_text = text.plain.rstrip("\r\n")
     output_format = output_settings.get("format", "markdown")
     if output_format == "plain":
-        console.print(plain_text)
+        console.print(plain_text, markup=False, emoji=False, highlight=False)
     else:
         console.print(Markdown(plain_text))
 
     metrics = get_metrics()
-    footer = "◼ Canceled." if stop_completion else "◼ Completed."
+    footer = "◼ Canceled." if stop_completion.is_set() else "◼ Completed."
     if metrics:
+        # Latency is zero if the completion was canceled before first token
         tokens_per_sec = (
             metrics.completion_tokens * 1000 / metrics.completion_latency_ms
+            if metrics.completion_latency_ms > 0
+            else 0
         )
         tokens = f" {tokens_per_sec:.2f} tokens/s." if tokens_per_sec > 0 else ""
         completion_tokens = (
@@ -93,7 +129,7 @@ def _print_logs(console: Console, verbose: bool, logs: str | None) -> None:
     if not verbose or not logs:
         return
     console.print()
-    console.print(logs)
+    console.print(logs, markup=False, emoji=False, highlight=False)
     console.print()
 
 
@@ -157,7 +193,7 @@ def main():
 @common_options
 def task(instruction: str, overrides_file: str, verbose: bool) -> int:
     """Run an instruction and generate response."""
-    from arey.task import create_task, run
+    from arey.task import close, create_task, run
 
     console = get_console()
     console.print()
@@ -194,25 +230,36 @@ def task(instruction: str, overrides_file: str, verbose: bool) -> int:
 def chat(verbose: bool, model: str | None) -> int:
     """Chat with an AI model."""
     import readline  # noqa enable GNU readline capabilities. # pyright: ignore[reportUnusedImport]
-    from arey.chat import create_chat, get_completion_metrics, stream_response
+    from arey.chat import (
+        Chat,
+        create_chat,
+        get_chat_model,
+        get_completion_metrics,
+        stream_response,
+    )
 
     console = get_console()
     console.print(("Welcome to arey chat!\nType 'q' to exit."))
     console.print()
 
-    with console.status("[message_footer]Loading model..."):
-        chat, model_metrics = create_chat(model)
-        footer = f"✓ Model loaded. {model_metrics.init_latency_ms / 1000:.2f}s."
-        console.print(footer, style="message_footer")
-        console.print()
+    # Config and model settings are validated upfront, errors are shown before
+    # the user types anything
+    chat_model = get_chat_model(model)
+
+    # Load the model while user types the first query. Note that stderr of the
+    # whole process is captured into model logs until the load completes, see
+    # `create_chat`. Main thread only waits on user input in this window.
+    loading_chat = _BackgroundCall(partial(create_chat, chat_model))
+
+    # Workaround for https://github.com/Textualize/rich/issues/2293
+    with console.capture() as capture:
+        console.print("> ", style="message_prompt", end="")
+    prompt_str = capture.get()
 
     console.print("How can I help you today?")
+    chat: Chat | None = None
     while True:
         # Get input from user
-        # Workaround for https://github.com/Textualize/rich/issues/2293
-        with console.capture() as capture:
-            console.print("> ", style="message_prompt", end="")
-        prompt_str = capture.get()
         try:
             user_input = input(prompt_str)
         except KeyboardInterrupt:
@@ -227,11 +274,18 @@ def chat(verbose: bool, model: str | None) -> int:
             break
 
         console.print()
+        if chat is None:
+            with console.status("[message_footer]Loading model..."):
+                chat, model_metrics = loading_chat.result()
+                footer = f"✓ Model loaded. {model_metrics.init_latency_ms / 1000:.2f}s."
+                console.print(footer, style="message_footer")
+                console.print()
+
         _generate_response(
             console,
             {},
-            lambda: stream_response(chat, user_input),
-            lambda: get_completion_metrics(chat),
+            partial(stream_response, chat, user_input),
+            partial(get_completion_metrics, chat),
         )
 
         _print_logs(
@@ -262,7 +316,14 @@ def play(file: str, no_watch: bool, verbose: bool) -> int:
 
     If FILE is not provided, a temporary file is created for edit.
     """
-    from arey.play import get_play_file, get_play_response, load_play_model
+    from watchfiles import watch
+
+    from arey.play import (
+        PlayFile,
+        get_play_file,
+        get_play_response,
+        load_play_model,
+    )
 
     console = get_console()
     console.print()
@@ -3,8 +3,10 @@
 
 import multiprocessing
 import os
+import threading
 import time
 from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Self, cast, override
 
@@ -34,6 +36,8 @@ class LlamaSettings(BaseModel):
     n_gpu_layers: int = 0
     use_mlock: bool = False
     verbose: bool = True
+    cache_size: int = 0
+    """Capacity in bytes of the prompt state cache. Disabled if zero."""
 
     @model_validator(mode="after")
     def validate_path(self) -> Self:
@@ -66,9 +70,13 @@ class LlamaBaseModel(CompletionModel):
         #     )
 
         self._llm = None
+        self._warmup: threading.Thread | None = None
         self._model_settings = LlamaSettings(**model_config.settings)  # pyright: ignore[reportAny]
         self._model_path = self._model_settings.path
 
+        # Chat history and prompts are counted on every turn, memoize them
+        self._count_tokens_cached = lru_cache(maxsize=4096)(self._count_tokens)
+
     @property
     @override
     def context_size(self) -> int:
@@ -83,19 +91,30 @@ class LlamaBaseModel(CompletionModel):
         return self._metrics
 
     def _get_model(self) -> llama_cpp.Llama:
-        model_path = os.path.join(os.path.expanduser(self._model_path))
-        if not os.path.exists(model_path):
-            raise AreyError(
-                "system",
-                f"Invalid model path: {model_path}.",
-            )
         if not self._llm:
+            # Path is expanded when settings are validated, check it still
+            # exists before the load
+            model_path = str(self._model_path)
+            if not os.path.exists(model_path):
+                raise AreyError(
+                    "system",
+                    f"Invalid model path: {model_path}.",
+                )
             start_time = time.perf_counter()
             self._llm = llama_cpp.Llama(
                 model_path=model_path,
-                **self._model_settings.model_dump(),  # pyright: ignore[reportAny]
+                **self._model_settings.model_dump(exclude={"cache_size"}),  # pyright: ignore[reportAny]
             )
-            # self._llm.set_cache(llama_cpp.LlamaCache(2 << 33))
+
+            # Llama reuses the evaluated prefix of the previous prompt by
+            # default. State cache helps when prompts don't share a prefix
+            # with the last one, at the cost of saving state per completion.
+            if self._model_settings.cache_size > 0:
+                self._llm.set_cache(
+                    llama_cpp.LlamaRAMCache(
+                        capacity_bytes=self._model_settings.cache_size
+                    )
+                )
 
             latency_ms = round((time.perf_counter() - start_time) * 1000, 2)
             self._metrics = ModelMetrics(init_latency_ms=latency_ms)
@@ -104,25 +123,38 @@ class LlamaBaseModel(CompletionModel):
     def _get_message_from_chat(
         self, message: ChatMessage
     ) -> llama_cpp.ChatCompletionRequestMessage:
-        if message.sender.role() == "system":
+        role = message.sender.role()
+        if role == "system":
             return llama_cpp.ChatCompletionRequestSystemMessage(
                 {"role": "system", "content": message.text}
             )
-        if message.sender.role() == "user":
+        if role == "user":
             return llama_cpp.ChatCompletionRequestUserMessage(
                 {"role": "user", "content": message.text}
             )
-        if message.sender.role() == "assistant":
+        if role == "assistant":
             return llama_cpp.ChatCompletionRequestAssistantMessage(
                 {"role": "assistant", "content": message.text}
             )
-        raise AreyError("system", f"Unknown message role: {message.sender.role()}")
+        raise AreyError("system", f"Unknown message role: {role}")
 
     @override
     def load(self, text: str):
         """Load a model into memory."""
         model = self._get_model()
-        model.eval(model.tokenize(text.encode("utf-8")))
+
+        # Warm up in background while user types the query. Any model
+        # evaluation must wait for this, see `_wait_for_warmup`.
+        self._warmup = threading.Thread(
+            target=lambda: model.eval(model.tokenize(text.encode("utf-8"))),
+            daemon=True,
+        )
+        self._warmup.start()
+
+    def _wait_for_warmup(self) -> None:
+        if self._warmup:
+            self._warmup.join()
+            self._warmup = None
 
     @override
     def complete(
@@ -132,7 +164,8 @@ class LlamaBaseModel(CompletionModel):
         if settings is None:
             settings = {}
 
-        prev_time = time.perf_counter()
+        self._wait_for_warmup()
+        prev_time = time.perf_counter_ns()
         model = self._get_model()
         completion_settings: dict[str, Any] = {
             "max_tokens": -1,
@@ -156,13 +189,14 @@ class LlamaBaseModel(CompletionModel):
         for chunk in output:
             chunk_text: str = cast(str, chunk["choices"][0]["delta"].get("content", ""))
 
-            current_time = time.perf_counter()
-            latency = current_time - prev_time
+            current_time = time.perf_counter_ns()
+            latency_ms = (current_time - prev_time) / 1_000_000
             prev_time = current_time
             if prompt_eval_latency == -1:
-                prompt_eval_latency = round(latency * 1000, 2)
+                prompt_eval_latency = latency_ms
 
-            token_count = self.count_tokens(chunk_text)
+            # llama-cpp streams a single token per chunk
+            token_count = 1 if chunk_text else 0
             yield CompletionResponse(
                 text=chunk_text,
                 finish_reason=chunk["choices"][0]["finish_reason"],
@@ -171,17 +205,22 @@ class LlamaBaseModel(CompletionModel):
                     prompt_eval_latency,
                     token_count,
                     1,
-                    round(latency * 1000, 2),
+                    latency_ms,
                 ),
             )
 
     @override
     def count_tokens(self, text: str) -> int:
         """Get the token count for given text."""
+        return self._count_tokens_cached(text)
+
+    def _count_tokens(self, text: str) -> int:
         model = self._get_model()
         return len(model.tokenize(text.encode("utf-8")))
 
     @override
     def free(self) -> None:
+        self._wait_for_warmup()
+        self._count_tokens_cached.cache_clear()
         if self._llm:
             del self._llm
@@ -53,13 +53,14 @@ class OllamaBaseModel(CompletionModel):
         return self._metrics
 
     def _get_message_from_chat(self, message: ChatMessage) -> Message:
-        if message.sender.role() == "system":
+        role = message.sender.role()
+        if role == "system":
             return {"role": "system", "content": message.text}
-        if message.sender.role() == "user":
+        if role == "user":
             return {"role": "user", "content": message.text}
-        if message.sender.role() == "assistant":
+        if role == "assistant":
             return {"role": "assistant", "content": message.text}
-        raise AreyError("system", f"Unknown message role: {message.sender.role()}")
+        raise AreyError("system", f"Unknown message role: {role}")
 
     @override
     def load(self, text: str) -> None:
@@ -77,7 +78,7 @@ class OllamaBaseModel(CompletionModel):
         self, messages: list[ChatMessage], settings: dict[str, Any]
     ) -> Iterator[CompletionResponse]:
         # TODO: add chat completion support
-        prev_time = time.perf_counter()
+        prev_time = time.perf_counter_ns()
         completion_settings = {
             "num_predict": -1,
             "temperature": 0.7,
@@ -102,11 +103,11 @@ class OllamaBaseModel(CompletionModel):
                 prompt_token_count = chunk.get("prompt_eval_count", 0)
                 token_count = chunk.get("eval_count", 0)
 
-            current_time = time.perf_counter()
-            latency = current_time - prev_time
+            current_time = time.perf_counter_ns()
+            latency_ms = (current_time - prev_time) / 1_000_000
             prev_time = current_time
             if prompt_eval_latency == -1:
-                prompt_eval_latency = round(latency * 1000, 2)
+                prompt_eval_latency = latency_ms
 
             yield CompletionResponse(
                 text=chunk_text,
@@ -116,7 +117,7 @@ class OllamaBaseModel(CompletionModel):
                     prompt_eval_latency,
                     token_count,
                     1,
-                    round(latency * 1000, 2),
+                    latency_ms,
                 ),
             )
 
@@ -3,7 +3,8 @@
 import os
 import time
 from collections.abc import Iterator
-from typing import Any, override
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, override
 
 from openai import OpenAI
 from openai.types.chat import (
@@ -24,6 +25,9 @@ from arey.core import (
     ModelMetrics,
 )
 
+if TYPE_CHECKING:
+    from tiktoken import Encoding
+
 
 class OpenAISettings(BaseModel):
     """Core model settings."""
@@ -74,7 +78,7 @@ class OpenAIBaseModel(CompletionModel):
         """Get a completion for the given text and settings."""
         assert self._client
 
-        prev_time = time.perf_counter()
+        prev_time = time.perf_counter_ns()
         completion_settings = {
             "temperature": 0.7,
         } | settings
@@ -93,11 +97,11 @@ class OpenAIBaseModel(CompletionModel):
             chunk_text = chunk.choices[0].delta.content or ""
             finish_reason = chunk.choices[0].finish_reason
 
-            current_time = time.perf_counter()
-            latency = current_time - prev_time
+            current_time = time.perf_counter_ns()
+            latency_ms = (current_time - prev_time) / 1_000_000
             prev_time = current_time
             if prompt_eval_latency == -1:
-                prompt_eval_latency = round(latency * 1000, 2)
+                prompt_eval_latency = latency_ms
 
             token_count = self.count_tokens(chunk_text)
             yield CompletionResponse(
@@ -108,7 +112,7 @@ class OpenAIBaseModel(CompletionModel):
                     prompt_eval_latency,
                     token_count,
                     1,
-                    round(latency * 1000, 2),
+                    latency_ms,
                 ),
             )
         pass
@@ -116,15 +120,20 @@ class OpenAIBaseModel(CompletionModel):
     @override
     def count_tokens(self, text: str) -> int:
         """Get the token count for given text."""
+        if self._encoding is None:
+            return 0
+        return len(self._encoding.encode(text))
+
+    @cached_property
+    def _encoding(self) -> "Encoding | None":
+        """Tokenizer for the model, resolved once since it's used on every turn."""
         try:
             import tiktoken
 
-            enc = tiktoken.encoding_for_model(self._model_name)
-            return len(enc.encode(text))
+            return tiktoken.encoding_for_model(self._model_name)
         except KeyError:
             # Allow OpenAI compatible server endpoints
-            pass
-        return 0
+            return None
 
     @override
     def free(self) -> None:
@@ -143,16 +152,17 @@ class OpenAIBaseModel(CompletionModel):
     def _get_message_from_chat(
         self, message: ChatMessage
     ) -> ChatCompletionMessageParam:
-        if message.sender.role() == "system":
+        role = message.sender.role()
+        if role == "system":
             return ChatCompletionSystemMessageParam(
                 {"role": "system", "content": message.text}
             )
-        if message.sender.role() == "user":
+        if role == "user":
             return ChatCompletionUserMessageParam(
                 {"role": "user", "content": message.text}
             )
-        if message.sender.role() == "assistant":
+        if role == "assistant":
             return ChatCompletionAssistantMessageParam(
                 {"role": "assistant", "content": message.text}
             )
-        raise AreyError("system", f"Unknown message role: {message.sender.role()}")
+        raise AreyError("system", f"Unknown message role: {role}")
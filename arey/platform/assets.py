@@ -1,7 +1,7 @@
 """Abstraction for various data and config assets in Arey."""
 
 import os
-
+from functools import cache
 
 DEFAULT_DATA_DIR = os.path.expanduser(
     "~/.local/share/arey" if os.name == "posix" else "~/.arey"
@@ -9,8 +9,12 @@ DEFAULT_DATA_DIR = os.path.expanduser(
 DEFAULT_CONFIG_DIR = os.path.expanduser(
     "~/.config/arey" if os.name == "posix" else "~/.arey"
 )
+DEFAULT_CACHE_DIR = os.path.expanduser(
+    "~/.cache/arey" if os.name == "posix" else "~/.arey/cache"
+)
 
 
+@cache
 def _make_dir(path: str) -> None:
     if not os.path.exists(path):
         os.makedirs(path, exist_ok=True)
@@ -49,6 +53,14 @@ def get_config_dir():
     return config_dir
 
 
+def get_cache_dir():
+    """Get arey cache dir."""
+    base_dir = os.environ.get("XDG_CACHE_HOME")
+    cache_dir = os.path.join(base_dir, "arey") if base_dir else DEFAULT_CACHE_DIR
+    _make_dir(cache_dir)
+    return cache_dir
+
+
 def get_default_config() -> str:
     """Get default configuration template."""
     config_file = get_asset_path("config.yml")
@@ -4,18 +4,22 @@
 from typing import Literal
 
 from arey.core import CompletionModel, ModelConfig
-from arey.platform._llama import LlamaBaseModel
-from arey.platform._ollama import OllamaBaseModel
-from arey.platform._openai import OpenAIBaseModel
 
 ModelType = Literal["openai", "ollama", "gguf"]
 
 
 def get_completion_llm(model_config: ModelConfig) -> CompletionModel:
     """Get a completion AI model."""
+    # Backends are imported on use, their client libraries are slow to import
     if model_config.type == "ollama":
+        from arey.platform._ollama import OllamaBaseModel
+
         return OllamaBaseModel(model_config)
     if model_config.type == "openai":
+        from arey.platform._openai import OpenAIBaseModel
+
         return OpenAIBaseModel(model_config)
 
+    from arey.platform._llama import LlamaBaseModel
+
     return LlamaBaseModel(model_config)
@@ -19,17 +19,15 @@ from arey.core import (
     ChatMessage,
     CompletionMetrics,
     CompletionModel,
+    MetricsAccumulator,
     ModelConfig,
     ModelMetrics,
     SenderType,
-    combine_metrics,
 )
 from arey.platform.assets import get_asset_path
 from arey.platform.console import capture_stderr
 from arey.platform.llm import get_completion_llm
 
-config = get_config()
-
 
 @dataclass
 class PlayResult:
@@ -85,7 +83,7 @@ def get_play_file(file_path: str) -> PlayFile:
         play_file = frontmatter.load(f)
 
     # FIXME validate settings
-    model_config = config.models.get(cast(str, play_file.metadata["model"]), None)
+    model_config = get_config().models.get(cast(str, play_file.metadata["model"]), None)
     model_settings = cast(dict[str, Any], play_file.metadata.get("settings", {}))
     completion_profile = cast(dict[str, Any], play_file.metadata.get("profile", {}))
     output_settings = cast(dict[str, str], play_file.metadata.get("output", {}))
@@ -123,21 +121,21 @@ def get_play_response(play_file: PlayFile) -> Iterator[str]:
 
     completion_settings = play_file.completion_profile
     prompt = play_file.prompt
-    ai_msg_text = ""
-    usage_series: list[CompletionMetrics] = []
+    ai_msg_parts: list[str] = []
     finish_reason = ""
+    usage = MetricsAccumulator()
     with capture_stderr() as stderr:
         for chunk in model.complete(
             [ChatMessage(sender=SenderType.USER, text=prompt)], completion_settings
         ):
-            ai_msg_text += chunk.text
+            ai_msg_parts.append(chunk.text)
             finish_reason = chunk.finish_reason
-            usage_series.append(chunk.metrics)
+            usage.add(chunk.metrics)
             yield chunk.text
 
     play_file.result = PlayResult(
-        response=ai_msg_text,
-        metrics=combine_metrics(usage_series),
+        response="".join(ai_msg_parts),
+        metrics=usage.result(),
         finish_reason=finish_reason,
         logs=stderr.getvalue(),
     )
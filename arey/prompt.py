@@ -2,6 +2,8 @@
 # pyright: basic
 
 import os
+import re
+from collections import ChainMap
 from dataclasses import dataclass, field
 from functools import lru_cache
 from string import Template
@@ -12,10 +14,39 @@ import yaml
 from arey.core import AreyError, SenderType
 from arey.platform.assets import get_asset_dir
 
-SYSTEM_TOKENS = set(["message_text", "chat_history", "user_query"])
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    # libyaml is not available, use the pure python loader
+    from yaml import SafeLoader  # pyright: ignore[reportAssignmentType]
 
+SYSTEM_TOKENS = frozenset({"message_text", "chat_history", "user_query"})
 
-@dataclass
+
+def _to_format_string(template: str) -> str:
+    """Convert a `string.Template` to an equivalent `str.format` string."""
+
+    def replace(match: re.Match[str]) -> str:
+        if match.group("escaped") is not None:
+            return "$"
+        name = match.group("named") or match.group("braced")
+        if name is None:
+            raise AreyError("template", f"Invalid placeholder in `{template}`.")
+        return f"{{{name}}}"
+
+    result: list[str] = []
+    end = 0
+    for match in Template.pattern.finditer(template):
+        # Escape the literal text, it may have braces
+        literal = template[end : match.start()]
+        result.append(literal.replace("{", "{{").replace("}", "}}"))
+        result.append(replace(match))
+        end = match.end()
+    result.append(template[end:].replace("{", "{{").replace("}", "}}"))
+    return "".join(result)
+
+
+@dataclass(slots=True)
 class Prompt:
     """An extensible prompt with dynamic template provided in a YML file.
 
@@ -29,10 +60,27 @@ class Prompt:
     prompts: dict[str, str] = field(default_factory=dict)  # task: prompt
     message_formats: dict[str, str] = field(default_factory=dict)  # role: format
 
+    # Templates compiled to `str.format` strings, see `__post_init__`
+    _prompt_formats: dict[str, str] = field(init=False, repr=False, compare=False)
+    _message_formats: dict[SenderType, str] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Compile the templates once, they are rendered for every message."""
+        self._prompt_formats = {
+            k: _to_format_string(v) for k, v in self.prompts.items() if v is not None
+        }
+        self._message_formats = {
+            sender: _to_format_string(self.message_formats[sender.role()])
+            for sender in SenderType
+            if self.message_formats.get(sender.role()) is not None
+        }
+
     @classmethod
     def create(cls, yml: str) -> "Prompt":
         """Create a prompt from yml file."""
-        content = yaml.safe_load(yml) or {}
+        content = yaml.load(yml, Loader=SafeLoader) or {}
         name = content.get("name", "")
         if not name:
             raise AreyError(
@@ -78,7 +126,7 @@ class Prompt:
     @classmethod
     def create_overrides(cls, yml: str) -> "Prompt":
         """Create an override prompt. They are merged with the base prompt."""
-        content = yaml.safe_load(yml) or {}
+        content = yaml.load(yml, Loader=SafeLoader) or {}
         name = content.get("name", "")
         if not name:
             raise AreyError(
@@ -99,8 +147,9 @@ class Prompt:
 
     def get(self, task: Literal["chat", "task"], context: dict[str, str]) -> str:
         """Get a prompt with tokens resolved from the context."""
-        merged_context = {**context, **self.custom_tokens}
-        return Template(self.prompts[task]).substitute(merged_context)
+        # Lookups go left to right, custom tokens take precedence
+        merged_context = ChainMap(self.custom_tokens, context)
+        return self._prompt_formats[task].format_map(merged_context)
 
     def get_message(
         self,
@@ -109,8 +158,10 @@ class Prompt:
         token_overrides: dict[str, str] = {},
     ) -> str:
         """Get a chat message for given role and text."""
-        merged_context = {"message_text": text} | self.custom_tokens | token_overrides
-        return Template(self.message_formats[role.role()]).substitute(merged_context)
+        merged_context = ChainMap(
+            token_overrides, self.custom_tokens, {"message_text": text}
+        )
+        return self._message_formats[role].format_map(merged_context)
 
 
 @lru_cache(maxsize=1)
@@ -135,11 +186,7 @@ def _get_oob_prompts() -> dict[str, Prompt]:
 
 def has_prompt(template_name: str) -> bool:
     """Check if prompt template is available."""
-    oob_prompts = getattr(has_prompt, "oob_prompts", set())
-    if not oob_prompts:
-        oob_prompts = set(_get_oob_prompts().keys())
-        setattr(has_prompt, "oob_prompts", oob_prompts)
-    return template_name in oob_prompts
+    return template_name in _get_oob_prompts()
 
 
 def get_prompt(template_name: str) -> Prompt:
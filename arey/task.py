@@ -6,27 +6,27 @@ A task is stateless execution of a single instruction.
 import os
 from collections.abc import Iterator
 from dataclasses import dataclass, field
+from typing import Any
 
 from arey.config import get_config
 from arey.core import (
     ChatMessage,
     CompletionMetrics,
     CompletionModel,
+    MetricsAccumulator,
     ModelMetrics,
     SenderType,
-    combine_metrics,
 )
 from arey.platform.console import capture_stderr
 from arey.platform.llm import get_completion_llm
 from arey.prompt import get_prompt_overrides
 
-config = get_config()
-model_config = config.task.model
-completion_settings = config.task.profile
-
-model: CompletionModel = get_completion_llm(model_config)
+_model: CompletionModel | None = None
 prompt_model = None  # get_prompt(prompt_template) if prompt_template else None
 
+# Completion settings are same for every task run, models don't mutate them
+_completion_settings: dict[str, Any] = {"stop": []}  # prompt_model.stop_words
+
 
 @dataclass
 class TaskResult:
@@ -46,6 +46,14 @@ class Task:
     result: TaskResult | None = None
 
 
+def _get_model() -> CompletionModel:
+    """Get the task model, it is created on first use."""
+    global _model
+    if _model is None:
+        _model = get_completion_llm(get_config().task.model)
+    return _model
+
+
 def create_task(prompt_file: str | None) -> tuple[Task, ModelMetrics]:
     """Create a task with given prompt file."""
     system_prompt = ""
@@ -56,6 +64,7 @@ def create_task(prompt_file: str | None) -> tuple[Task, ModelMetrics]:
             else {}
         )
         system_prompt = prompt_model.get_message("system", "", token_overrides)
+    model = _get_model()
     with capture_stderr():
         model.load(system_prompt)
     task = Task()
@@ -73,21 +82,20 @@ def run(task: Task, user_input: str) -> Iterator[str]:
         ChatMessage(sender=SenderType.USER, text=user_input[0])
     ]  # prompt_model.get("task", context)
 
-    ai_msg_text = ""
-    usage_series: list[CompletionMetrics] = []
+    ai_msg_parts: list[str] = []
     finish_reason = ""
+    usage = MetricsAccumulator()
+    model = _get_model()
     with capture_stderr() as stderr:
-        for chunk in model.complete(
-            messages=prompt, settings={"stop": []}
-        ):  # prompt_model.stop_words}):
-            ai_msg_text += chunk.text
+        for chunk in model.complete(messages=prompt, settings=_completion_settings):
+            ai_msg_parts.append(chunk.text)
             finish_reason = chunk.finish_reason
-            usage_series.append(chunk.metrics)
+            usage.add(chunk.metrics)
             yield chunk.text
 
     task.result = TaskResult(
-        response=ai_msg_text,
-        metrics=combine_metrics(usage_series),
+        response="".join(ai_msg_parts),
+        metrics=usage.result(),
         finish_reason=finish_reason,
         logs=stderr.getvalue(),
     )
@@ -95,5 +103,5 @@ def run(task: Task, user_input: str) -> Iterator[str]:
 
 def close(_task: Task):
     """Close a task and free the model."""
-    if model:
-        model.free()
+    if _model:
+        _model.free()
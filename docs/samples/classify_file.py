@@ -3,9 +3,9 @@
 # pyright: basic
 
 import argparse
-import glob
 import json
 import os
+from collections.abc import Iterator
 from io import StringIO
 
 import frontmatter
@@ -15,6 +15,29 @@ from arey.task import Task, create_task, run
 
 console = Console()
 
+# Instruction is fixed, only the summary and keywords vary per file. Keep it at
+# the start of the prompt, llama reuses the evaluated prefix for next file.
+_INSTRUCTION_PREFIX = (
+    "Classify provided summary and keywords in JSON format: "
+    '{"category": ["Technology", "Life", "Philosophy"]}. '
+    "Choose only one category and always respond in JSON format. "
+    "Here's the text:\n```\nsummary: "
+)
+
+
+def _iter_markdown_files(root: str) -> Iterator[str]:
+    """Recursively yield paths of markdown files under root."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".md"):
+                    yield entry.path
+
 
 def classify_summary_keywords(task: Task, path: str, write: bool) -> None:
     """Classify a text represented by summary and keywords into a category."""
@@ -24,15 +47,9 @@ def classify_summary_keywords(task: Task, path: str, write: bool) -> None:
         if "auto_category" in post.metadata:
             console.print("  [yellow]Skipping file since category exists.")
             return
-        content = (
-            f"```\nsummary: {post['auto_summary']}\n"
-            f"keywords: {post['auto_keywords']}\n```"
-        )
         instruction = (
-            "Classify provided summary and keywords in JSON format: "
-            '{"category": ["Technology", "Life", "Philosophy"]}. '
-            "Choose only one category and always respond in JSON format. "
-            f"Here's the text:\n{content}\n"
+            f"{_INSTRUCTION_PREFIX}{post['auto_summary']}\n"
+            f"keywords: {post['auto_keywords']}\n```\n"
         )
         text = StringIO()
         for response in run(task, instruction):
@@ -60,7 +77,7 @@ def main(path: str, write: bool):
     task, _ = create_task(classify_overrides)
 
     if os.path.isdir(path):
-        for file in glob.iglob(os.path.join(path, "**", "*.md"), recursive=True):
+        for file in _iter_markdown_files(path):
             classify_summary_keywords(task, file, write)
         return
 
@@ -3,9 +3,9 @@
 
 # pyright: basic, reportAny=false
 import argparse
-import glob
 import json
 import os
+from collections.abc import Iterator
 from io import StringIO
 
 import frontmatter
@@ -17,9 +17,35 @@ from arey.task import Task, create_task, run
 
 console = Console()
 
+# Instruction is fixed, only the text varies per file. Keep it at the start of
+# the prompt, llama reuses the evaluated prefix of previous prompt for next file.
+_INSTRUCTION_PREFIX = (
+    "Summarize below text in JSON format: "
+    '{"summary": "", "keywords": []}. '
+    "Here's the text:\n```\n"
+)
+_INSTRUCTION_SUFFIX = "\n```\n"
+
+# Parser is stateless across renders, create it once
+_markdown = MarkdownIt()
+
+
+def _iter_markdown_files(root: str) -> Iterator[str]:
+    """Recursively yield paths of markdown files under root."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".md"):
+                    yield entry.path
+
 
 def _convert_to_text(markdown: str):
-    html_content = MarkdownIt().render(markdown)
+    html_content = _markdown.render(markdown)
     return "".join(BeautifulSoup(html_content, features="lxml").find_all(string=True))
 
 
@@ -35,11 +61,7 @@ def summarize_markdown_file(task: Task, path: str, write: bool) -> None:
             )
             return
         content = _convert_to_text(post.content)
-        instruction = (
-            "Summarize below text in JSON format: "
-            '{"summary": "", "keywords": []}. '
-            f"Here's the text:\n```\n{content}\n```\n"
-        )
+        instruction = f"{_INSTRUCTION_PREFIX}{content}{_INSTRUCTION_SUFFIX}"
         text = StringIO()
         for response in run(task, instruction):
             text.write(response)
@@ -66,7 +88,7 @@ def main(path: str, write: bool):
     task, _ = create_task(summarize_overrides)
 
     if os.path.isdir(path):
-        for file in glob.iglob(os.path.join(path, "**", "*.md"), recursive=True):
+        for file in _iter_markdown_files(path):
             summarize_markdown_file(task, file, write)
         return
 
@@ -2,6 +2,7 @@
 # pyright: strict, reportUnknownMemberType=false
 
 import os
+from functools import cache
 
 from pyfakefs.fake_filesystem import FakeFilesystem
 
@@ -21,7 +22,15 @@ def get_dummy_config(fs: FakeFilesystem) -> str:
     fs.create_file(os.path.expanduser(DUMMY_7B_MODEL))
 
     fs.pause()
+    try:
+        return _read_dummy_config()
+    finally:
+        fs.resume()
+
+
+@cache
+def _read_dummy_config() -> str:
+    # Content is static, read it from the real filesystem once per session
     dir_path = os.path.dirname(os.path.realpath(__file__))
     with open(os.path.join(dir_path, "test_config.yml"), "r") as f:
-        fs.resume()
         return f.read()
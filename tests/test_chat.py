@@ -0,0 +1,144 @@
+"""Tests for the chat service."""
+# pyright: basic
+
+from collections.abc import Iterator
+from typing import Any
+
+from arey.chat import (
+    _MESSAGE_OVERHEAD_TOKENS,
+    _REPLY_TOKENS,
+    Chat,
+    Message,
+    _get_max_tokens,
+    get_history,
+)
+from arey.core import (
+    ChatMessage,
+    CompletionModel,
+    CompletionResponse,
+    ModelMetrics,
+    SenderType,
+)
+
+
+class DummyModel(CompletionModel):
+    """A model which counts a token per word."""
+
+    def __init__(self, context_size: int = 0) -> None:
+        """Create a model, counted texts are recorded."""
+        self._context_size = context_size
+        self.counted: list[str] = []
+
+    @property
+    def context_size(self) -> int:
+        return self._context_size
+
+    @property
+    def metrics(self) -> ModelMetrics:
+        return ModelMetrics(init_latency_ms=0)
+
+    def load(self, text: str):
+        pass
+
+    def complete(
+        self, messages: list[ChatMessage], settings: dict[str, Any]
+    ) -> Iterator[CompletionResponse]:
+        raise NotImplementedError
+
+    def count_tokens(self, text: str) -> int:
+        self.counted.append(text)
+        return len(text.split())
+
+    def free(self) -> None:
+        pass
+
+
+def _create_chat(*texts: str) -> Chat:
+    # Messages alternate between user and assistant, starting with user
+    senders = [SenderType.USER, SenderType.ASSISTANT]
+    return Chat(
+        messages=[
+            Message(text=t, sender=senders[i % 2], timestamp=0, context=None)
+            for i, t in enumerate(texts)
+        ]
+    )
+
+
+def _cost(words: int) -> int:
+    return words + _MESSAGE_OVERHEAD_TOKENS
+
+
+def test_get_max_tokens_reserves_reply_and_template_tokens():
+    assert _get_max_tokens(DummyModel(0)) == 0
+    assert _get_max_tokens(DummyModel(4096)) == (
+        4096 - _REPLY_TOKENS - _MESSAGE_OVERHEAD_TOKENS
+    )
+    assert _get_max_tokens(DummyModel(100)) == 1
+
+
+def test_get_history_returns_all_messages_for_zero_budget():
+    model = DummyModel()
+    chat = _create_chat("a b", "c d", "e f")
+
+    history = get_history(model, chat, 0)
+
+    assert history == chat.messages
+    assert model.counted == []
+
+
+def test_get_history_trims_messages_beyond_budget():
+    model = DummyModel()
+    chat = _create_chat("u1 u1", "a1 a1", "u2 u2", "a2 a2", "u3 u3")
+
+    history = get_history(model, chat, 3 * _cost(2))
+
+    assert [m.text for m in history] == ["u2 u2", "a2 a2", "u3 u3"]
+
+
+def test_get_history_starts_with_user_message():
+    model = DummyModel()
+    chat = _create_chat("u1 u1", "a1 a1", "u2 u2")
+
+    history = get_history(model, chat, 2 * _cost(2))
+
+    assert [m.text for m in history] == ["u2 u2"]
+    assert history[0].sender == SenderType.USER
+
+
+def test_get_history_includes_latest_message_beyond_budget():
+    model = DummyModel()
+    chat = _create_chat("u1", "a1", "u2 " * 100)
+
+    history = get_history(model, chat, _cost(10))
+
+    assert [m.text for m in history] == ["u2 " * 100]
+
+
+def test_get_history_skips_tokenizing_messages_which_cannot_fit():
+    model = DummyModel()
+    long_text = "x" * 1000
+    chat = _create_chat(long_text, "a1", "u2")
+
+    history = get_history(model, chat, 2 * _cost(1) + 4)
+
+    assert [m.text for m in history] == ["u2"]
+    assert long_text not in model.counted
+    assert chat.messages[0].token_count is None
+
+
+def test_get_history_counts_tokens_of_a_message_once():
+    model = DummyModel()
+    chat = _create_chat("u1 u1", "a1 a1", "u2 u2")
+
+    get_history(model, chat, 100)
+    chat.messages.append(
+        Message(text="a2", sender=SenderType.ASSISTANT, timestamp=0, context=None)
+    )
+    chat.messages.append(
+        Message(text="u3", sender=SenderType.USER, timestamp=0, context=None)
+    )
+    history = get_history(model, chat, 100)
+
+    assert len(history) == 5
+    assert model.counted == ["u2 u2", "a1 a1", "u1 u1", "u3", "a2"]
+    assert [m.token_count for m in chat.messages] == [2, 2, 2, 1, 1]
@@ -0,0 +1,23 @@
+"""Tests for the completion contracts."""
+# pyright: basic
+
+from arey.core import CompletionMetrics, MetricsAccumulator
+
+
+def test_metrics_accumulator_sums_completion_tokens_and_latency():
+    usage = MetricsAccumulator()
+
+    usage.add(CompletionMetrics(10, 120.5, 1, 1, 120.5))
+    usage.add(CompletionMetrics(10, 0.0, 2, 1, 20.25))
+    usage.add(CompletionMetrics(12, 0.0, 1, 1, 10.0))
+    metrics = usage.result()
+
+    assert metrics.prompt_tokens == 12
+    assert metrics.prompt_eval_latency_ms == 120.5
+    assert metrics.completion_tokens == 4
+    assert metrics.completion_runs == 3
+    assert metrics.completion_latency_ms == 150.75
+
+
+def test_metrics_accumulator_returns_zero_metrics_for_empty_completion():
+    assert MetricsAccumulator().result() == CompletionMetrics(0, 0.0, 0, 0, 0.0)
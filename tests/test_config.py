@@ -1,17 +1,29 @@
 """Unit tests for the configuration module."""
 # pyright: basic
 
+import json
 import os
 
 import pytest
 from pytest_mock import MockerFixture
 
+import arey.config
 from arey.config import create_or_get_config_file, get_config
-from arey.platform.assets import DEFAULT_CONFIG_DIR
+from arey.core import AreyError
+from arey.platform.assets import DEFAULT_CONFIG_DIR, _make_dir
 
 from .doubles.config import get_dummy_config
 
 DEFAULT_CONFIG_FILE = os.path.join(DEFAULT_CONFIG_DIR, "arey.yml")
+CACHE_DIR = "/cache"
+CONFIG_CACHE_FILE = os.path.join(CACHE_DIR, "arey", "config.json")
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache(monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", CACHE_DIR)
+    get_config.cache_clear()
+    _make_dir.cache_clear()
 
 
 @pytest.fixture
@@ -39,16 +51,53 @@ def test_create_or_get_config_file_when_not_exist(fs, default_config_file):
     assert file == DEFAULT_CONFIG_FILE
 
 
-def test_get_config_throws_for_nonexistent_file(fs, mocker: MockerFixture):
-    mocker.patch("os.path.exists", return_value=False)
-    mocker.patch("os.mkdir")
-
+def test_get_config_throws_for_nonexistent_file(fs):
+    # Default config asset isn't available in fake filesystem, so a config file
+    # can't be created
     with pytest.raises(Exception) as e:
         get_config()
 
     assert e.value.args[0]
 
 
+def test_get_config_throws_for_empty_file(fs):
+    fs.create_dir(DEFAULT_CONFIG_DIR)
+    fs.create_file(DEFAULT_CONFIG_FILE, contents="")
+
+    with pytest.raises(AreyError) as e:
+        get_config()
+
+    assert e.value.category == "config"
+    assert not os.path.exists(CONFIG_CACHE_FILE)
+
+
+def test_get_config_does_not_cache_invalid_config(fs):
+    fs.create_dir(DEFAULT_CONFIG_DIR)
+    content = get_dummy_config(fs).replace("  precise:", "  1:", 1)
+    fs.create_file(DEFAULT_CONFIG_FILE, contents=content)
+
+    for _ in range(2):
+        get_config.cache_clear()
+        with pytest.raises(Exception):
+            get_config()
+
+    assert not os.path.exists(CONFIG_CACHE_FILE)
+
+
+def test_get_config_does_not_cache_non_string_keys(fs):
+    fs.create_dir(DEFAULT_CONFIG_DIR)
+    content = get_dummy_config(fs).replace(
+        'base_url: "http://dummy/url"\n',
+        'base_url: "http://dummy/url"\n    headers:\n      yes: "x"\n',
+    )
+    fs.create_file(DEFAULT_CONFIG_FILE, contents=content)
+
+    config = get_config()
+
+    assert config.models["dummy-openai"].settings["headers"] == {True: "x"}
+    assert not os.path.exists(CONFIG_CACHE_FILE)
+
+
 def test_get_config_return_config_for_valid_schema(fs, default_config_file):
     config1 = get_config()
 
@@ -57,3 +106,74 @@ def test_get_config_return_config_for_valid_schema(fs, default_config_file):
     assert config1 is not None
     assert config1 == config2
     assert len(config1.profiles) == 3
+
+
+def test_get_config_writes_json_cache(fs, default_config_file):
+    get_config()
+
+    with open(CONFIG_CACHE_FILE, "r") as f:
+        cache = json.load(f)
+    stat = os.stat(DEFAULT_CONFIG_FILE)
+    assert cache["key"] == [DEFAULT_CONFIG_FILE, stat.st_mtime_ns, stat.st_size]
+    assert "dummy-7b" in cache["config"]["models"]
+    assert cache["config"]["chat"]["model"] == "dummy-7b"
+    assert os.stat(CONFIG_CACHE_FILE).st_mode & 0o777 == 0o600
+    assert not os.path.exists(f"{DEFAULT_CONFIG_FILE}.json")
+
+
+def test_get_config_ignores_json_cache_with_invalid_config(fs, default_config_file):
+    get_config()
+    get_config.cache_clear()
+    with open(CONFIG_CACHE_FILE, "r") as f:
+        cache = json.load(f)
+    with open(CONFIG_CACHE_FILE, "w") as f:
+        json.dump({"key": cache["key"], "config": ["invalid"]}, f)
+
+    config = get_config()
+
+    assert len(config.profiles) == 3
+
+
+def test_get_config_reads_from_json_cache(fs, default_config_file, mocker):
+    get_config()
+    get_config.cache_clear()
+    yaml_load = mocker.patch("arey.config.yaml.load")
+
+    config = get_config()
+
+    yaml_load.assert_not_called()
+    assert len(config.profiles) == 3
+
+
+def test_get_config_ignores_stale_json_cache(fs, default_config_file, mocker):
+    get_config()
+    get_config.cache_clear()
+    with open(DEFAULT_CONFIG_FILE, "a") as f:
+        f.write("\n# updated\n")
+    stat = os.stat(DEFAULT_CONFIG_FILE)
+    os.utime(DEFAULT_CONFIG_FILE, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    yaml_load = mocker.spy(arey.config.yaml, "load")
+
+    config = get_config()
+
+    yaml_load.assert_called_once()
+    assert len(config.profiles) == 3
+    with open(CONFIG_CACHE_FILE, "r") as f:
+        cache = json.load(f)
+    assert cache["key"][1] == stat.st_mtime_ns + 1
+
+
+def test_get_config_ignores_json_cache_for_same_mtime_edit(
+    fs, default_config_file, mocker
+):
+    get_config()
+    get_config.cache_clear()
+    stat = os.stat(DEFAULT_CONFIG_FILE)
+    with open(DEFAULT_CONFIG_FILE, "a") as f:
+        f.write("\n# updated\n")
+    os.utime(DEFAULT_CONFIG_FILE, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    yaml_load = mocker.spy(arey.config.yaml, "load")
+
+    get_config()
+
+    yaml_load.assert_called_once()
@@ -0,0 +1,37 @@
+"""Tests for the cli."""
+# pyright: basic
+
+import pytest
+from rich.console import Console
+
+from arey.core import AreyError, CompletionMetrics
+from arey.main import _BackgroundCall, _generate_response
+from arey.platform.console import theme
+
+
+def test_generate_response_prints_footer_for_empty_completion():
+    console = Console(theme=theme, record=True, width=200)
+    metrics = CompletionMetrics(0, 0.0, 0, 0, 0.0)
+
+    _generate_response(console, {"format": "plain"}, lambda: [], lambda: metrics)
+
+    output = console.export_text()
+    assert "◼ Completed. 0.00s to first token. 0.00s total." in output
+    assert "tokens/s" not in output
+
+
+def test_background_call_returns_result():
+    call = _BackgroundCall(lambda: 42)
+
+    assert call.result() == 42
+
+
+def test_background_call_raises_error_on_result():
+    def fail() -> int:
+        raise AreyError("config", "Invalid model path.")
+
+    call = _BackgroundCall(fail)
+
+    with pytest.raises(AreyError) as e:
+        call.result()
+    assert e.value.category == "config"
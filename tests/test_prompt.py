@@ -1,4 +1,12 @@
 """Tests for the prompts."""
+# pyright: basic
+
+from string import Template
+
+import pytest
+
+from arey.core import AreyError, SenderType
+from arey.prompt import Prompt, _get_oob_prompts, get_prompt, has_prompt
 
 
 def prompts_should_be_valid():
@@ -8,3 +16,61 @@ def prompts_should_be_valid():
 def get_prompt_should_throw_on_invalid_template_name():
     # with pytest.raises(Argumen
     pass
+
+
+def _get_valid_prompts() -> list[Prompt]:
+    # openorca template uses an older format, it can't be rendered
+    return [p for p in _get_oob_prompts().values() if isinstance(p.custom_tokens, dict)]
+
+
+def test_prompt_get_matches_template_substitution():
+    context = {"user_query": "What's {up}?", "chat_history": "$history"}
+    for prompt in _get_valid_prompts():
+        for task in ["chat", "task"]:
+            merged_context = {**context, **prompt.custom_tokens}
+            expected = Template(prompt.prompts[task]).substitute(merged_context)
+
+            assert prompt.get(task, context) == expected  # pyright: ignore
+
+
+def test_prompt_get_message_matches_template_substitution():
+    for prompt in _get_valid_prompts():
+        for role in SenderType:
+            merged_context = {"message_text": "hi {there}"} | prompt.custom_tokens
+            template = Template(prompt.message_formats[role.role()])
+            expected = template.substitute(merged_context)
+
+            assert prompt.get_message(role, "hi {there}") == expected
+
+
+def test_prompt_get_message_token_overrides_take_precedence():
+    prompt = Prompt(
+        "dummy",
+        custom_tokens={"prefix": "A", "suffix": "B"},
+        message_formats={"user": "$prefix$message_text$suffix"},
+    )
+
+    result = prompt.get_message(SenderType.USER, "hi", {"suffix": "C"})
+
+    assert result == "AhiC"
+    assert prompt.custom_tokens == {"prefix": "A", "suffix": "B"}
+
+
+def test_prompt_escapes_literal_braces_and_dollars():
+    prompt = Prompt(
+        "dummy",
+        prompts={"chat": "{json}: $$ ${user_query}s", "task": "$user_query"},
+    )
+
+    assert prompt.get("chat", {"user_query": "q"}) == "{json}: $ qs"
+
+
+def test_prompt_throws_for_invalid_placeholder():
+    with pytest.raises(AreyError):
+        Prompt("dummy", prompts={"chat": "$ invalid", "task": ""})
+
+
+def test_get_prompt_returns_same_instance():
+    assert has_prompt("chatml")
+    assert not has_prompt("dummy")
+    assert get_prompt("chatml") is get_prompt("chatml")
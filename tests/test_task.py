@@ -0,0 +1,26 @@
+"""Tests for the task service."""
+# pyright: basic
+
+from arey.core import CompletionMetrics, CompletionResponse
+from arey.task import Task, run
+
+
+def test_run_accumulates_response_and_metrics(mocker):
+    metrics = CompletionMetrics(10, 120.5, 1, 1, 20.0)
+    chunks = [
+        CompletionResponse(text=t, finish_reason=r, metrics=metrics)
+        for t, r in zip(["Hello", ", ", "world"], [None, None, "stop"])
+    ]
+    model = mocker.MagicMock()
+    model.complete.return_value = iter(chunks)
+    mocker.patch("arey.task._model", model)
+    task = Task()
+
+    response = list(run(task, "hi"))
+
+    assert response == ["Hello", ", ", "world"]
+    assert task.result is not None
+    assert task.result.response == "Hello, world"
+    assert task.result.finish_reason == "stop"
+    assert task.result.metrics.completion_tokens == 3
+    assert task.result.metrics.completion_runs == 3